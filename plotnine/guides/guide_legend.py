@@ -299,8 +299,8 @@ class guide_legend(guide):
         # labels
         labels = []
         for item in self.key['label']:
-            if isinstance(item, np.float) and np.float.is_integer(item):
-                item = np.int(item)  # 1.0 to 1
+            if isinstance(item, float) and float.is_integer(item):
+                item = int(item)  # 1.0 to 1
             va = 'center' if self.label_position == 'top' else 'baseline'
             ta = TextArea(item, textprops=dict(color='black', va=va))
             labels.append(ta)
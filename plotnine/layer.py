@@ -1,4 +1,6 @@
 from copy import copy, deepcopy
+from operator import methodcaller
+import datetime
 import numbers
 
 import pandas as pd
@@ -7,8 +9,8 @@ import pandas.api.types as pdtypes
 from patsy.eval import EvalEnvironment
 
 from .exceptions import PlotnineError
-from .utils import array_kind, ninteraction
-from .utils import check_required_aesthetics, defaults
+from .utils import ninteraction, DISCRETE_KINDS
+from .utils import check_required_aesthetics
 from .aes import aes, get_calculated_aes, stat, AES_INNER_NAMESPACE
 from .aes import strip_calculated_markers, NO_GROUP
 
@@ -22,6 +24,13 @@ The '{}' mapping: '{}' produced a value of type '{}',\
 but only single items and lists/arrays can be used. \
 (original error: {})"""
 
+_SCALAR_TYPES = (numbers.Number, np.number)
+_DATETIME_TYPES = (datetime.datetime, datetime.timedelta,
+                   np.datetime64, np.timedelta64)
+
+# Largest key when combining the codes of discrete columns
+_MAX_KEY = np.iinfo(np.int64).max
+
 
 class Layers(list):
     """
@@ -62,13 +71,19 @@ class Layers(list):
     def data(self):
         return [l.data for l in self]
 
-    def generate_data(self, plot_data):
+    def _apply(self, name, *args):
+        """
+        Call method `name` of every layer with `args`
+        """
+        caller = methodcaller(name, *args)
         for l in self:
-            l.generate_data(plot_data)
+            caller(l)
+
+    def generate_data(self, plot_data):
+        self._apply('generate_data', plot_data)
 
     def setup_data(self):
-        for l in self:
-            l.setup_data()
+        self._apply('setup_data')
 
     def draw(self, layout, coord):
         # If zorder is 0, it is left to MPL
@@ -77,40 +92,37 @@ class Layers(list):
             l.draw(layout, coord)
 
     def compute_aesthetics(self, plot):
-        for l in self:
-            l.compute_aesthetics(plot)
+        self._apply('compute_aesthetics', plot)
 
     def compute_statistic(self, layout):
-        for l in self:
-            l.compute_statistic(layout)
+        self._apply('compute_statistic', layout)
 
     def map_statistic(self, plot):
-        for l in self:
-            l.map_statistic(plot)
+        self._apply('map_statistic', plot)
 
     def compute_position(self, layout):
-        for l in self:
-            l.compute_position(layout)
+        self._apply('compute_position', layout)
 
     def use_defaults(self):
-        for l in self:
-            l.use_defaults()
+        self._apply('use_defaults')
 
     def transform(self, scales):
+        transform_df = scales.transform_df
         for l in self:
-            l.data = scales.transform_df(l.data)
+            l.data = transform_df(l.data)
 
     def train(self, scales):
+        train_df = scales.train_df
         for l in self:
-            l.data = scales.train_df(l.data)
+            l.data = train_df(l.data)
 
     def map(self, scales):
+        map_df = scales.map_df
         for l in self:
-            l.data = scales.map_df(l.data)
+            l.data = map_df(l.data)
 
     def finish_statistics(self):
-        for l in self:
-            l.finish_statistics()
+        self._apply('finish_statistics')
 
     def update_labels(self, plot):
         for l in self:
@@ -216,11 +228,14 @@ class layer:
         old = self.__dict__
         new = result.__dict__
 
+        # The data is shared, immutable values need no copying
+        # and everything else is deep copied.
+        new['data'] = old['data']
+        new['inherit_aes'] = old['inherit_aes']
+        new['zorder'] = old['zorder']
         for key, item in old.items():
-            if key == 'data':
-                new[key] = old[key]
-            else:
-                new[key] = deepcopy(old[key], memo)
+            if key not in new:
+                new[key] = deepcopy(item, memo)
 
         return result
 
@@ -275,15 +290,15 @@ class layer:
         # ignore the default aesthetics and only use those
         # set in the layer
         if self.inherit_aes:
-            aesthetics = defaults(self.mapping, mapping)
+            aesthetics = _merge_mappings(self.mapping, mapping)
         else:
             aesthetics = self.mapping
 
         # drop aesthetic parameters or the calculated aesthetics
-        calculated = set(get_calculated_aes(aesthetics))
-        d = dict((ae, v) for ae, v in aesthetics.items()
-                 if (ae not in self.geom.aes_params) and
-                 (ae not in calculated))
+        aes_params = self.geom.aes_params
+        calculated = frozenset(get_calculated_aes(aesthetics))
+        d = {ae: v for ae, v in aesthetics.items()
+             if ae not in aes_params and ae not in calculated}
         self._active_mapping = aes(**d)
         return self._active_mapping
 
@@ -296,17 +311,23 @@ class layer:
         expression evaluation are  made in here
         """
         data = self.data
+        n_data = len(data)
         aesthetics = self.layer_mapping(plot.mapping)
 
-        env = EvalEnvironment.capture(eval_env=plot.environment)
-        env = env.with_outer_namespace(AES_INNER_NAMESPACE)
+        # The evaluation environment is only needed when a mapping
+        # is not a column in the data, so it is created on demand
+        env = None
+        data_cols = set(data.columns)
 
-        # Using `type` preserves the subclass of pd.DataFrame
-        evaled = type(data)(index=data.index)
+        # The evaluated aesthetics are collected and the dataframe
+        # is created in one go. With no data, the rows are set by
+        # the first vector or scalar supplied to an aesthetic.
+        index = data.index
+        cols = {}
 
         # Override grouping if set in layer.
         if 'group' in self.geom.aes_params:
-            evaled['group'] = self.geom.aes_params['group']
+            cols['group'] = self.geom.aes_params['group']
             if 'group' in aesthetics:
                 del aesthetics['group']
 
@@ -314,9 +335,14 @@ class layer:
         # in the environment of the call to ggplot
         for ae, col in aesthetics.items():
             if isinstance(col, str):
-                if col in data:
-                    evaled[ae] = data[col]
+                if col in data_cols:
+                    cols[ae] = data[col]
                 else:
+                    if env is None:
+                        env = EvalEnvironment.capture(
+                            eval_env=plot.environment)
+                        env = env.with_outer_namespace(AES_INNER_NAMESPACE)
+
                     try:
                         new_val = env.eval(col, inner_namespace=data)
                     except Exception as e:
@@ -324,33 +350,44 @@ class layer:
                             _TPL_EVAL_FAIL.format(ae, col, str(e)))
 
                     try:
-                        evaled[ae] = new_val
+                        if (not len(index) and
+                                pdtypes.is_list_like(new_val)):
+                            new_val = pd.Series(new_val)
+                            index = new_val.index
+                        cols[ae] = pd.Series(new_val, index=index)
                     except Exception as e:
                         raise PlotnineError(
                             _TPL_BAD_EVAL_TYPE.format(
                                 ae, col, str(type(new_val)), str(e)))
             elif pdtypes.is_list_like(col):
                 n = len(col)
-                if len(data) and n != len(data) and n != 1:
+                if n_data and n != n_data and n != 1:
                     raise PlotnineError(
                         "Aesthetics must either be length one, " +
                         "or the same length as the data")
                 # An empty dataframe does not admit a scalar value
-                elif len(evaled) and n == 1:
+                elif len(index) and n == 1:
                     col = col[0]
-                evaled[ae] = col
+                elif not len(index):
+                    if not isinstance(col, pd.Series):
+                        col = pd.Series(col)
+                    index = col.index
+                cols[ae] = col
             elif is_known_scalar(col):
-                if not len(evaled):
+                if not len(index):
                     col = [col]
-                evaled[ae] = col
+                    index = pd.RangeIndex(1)
+                cols[ae] = col
             else:
                 msg = "Do not know how to deal with aesthetic '{}'"
                 raise PlotnineError(msg.format(ae))
 
-        evaled_aes = aes(**dict((col, col) for col in evaled))
+        # Using `type` preserves the subclass of pd.DataFrame
+        evaled = type(data)(cols, index=index)
+        evaled_aes = aes(**{col: col for col in evaled.columns})
         plot.scales.add_defaults(evaled, evaled_aes)
 
-        if len(data) == 0 and len(evaled) > 0:
+        if n_data == 0 and len(evaled) > 0:
             # No data, and vectors suppled to aesthetics
             evaled['PANEL'] = 1
         else:
@@ -364,7 +401,7 @@ class layer:
         """
         data = self.data
         if not len(data):
-            return type(data)()
+            return data
 
         params = self.stat.setup_params(data)
         data = self.stat.use_defaults(data)
@@ -378,28 +415,26 @@ class layer:
         """
         data = self.data
         if not len(data):
-            return type(data)()
+            return data
 
         # Assemble aesthetics from layer, plot and stat mappings
-        aesthetics = deepcopy(self.mapping)
+        aesthetics = self.mapping
         if self.inherit_aes:
-            aesthetics = defaults(aesthetics, plot.mapping)
+            aesthetics = _merge_mappings(aesthetics, plot.mapping)
 
-        aesthetics = defaults(aesthetics, self.stat.DEFAULT_AES)
+        aesthetics = _merge_mappings(aesthetics, self.stat.DEFAULT_AES)
 
         # The new aesthetics are those that the stat calculates
         # and have been mapped to with dot dot notation
         # e.g aes(y='..count..'), y is the new aesthetic and
         # 'count' is the computed column in data
         new = {}  # {'aesthetic_name': 'calculated_stat'}
-        stat_data = type(data)()
+        stat_data = {}
         stat_namespace = dict(stat=stat)
         env = plot.environment.with_outer_namespace(stat_namespace)
         for ae in get_calculated_aes(aesthetics):
             new[ae] = strip_calculated_markers(aesthetics[ae])
-            # In conjuction with the pd.concat at the end,
-            # be careful not to create duplicate columns
-            # for cases like y='..y..'
+            # Nothing to compute for cases like y='..y..'
             if new[ae] != ae:
                 stat_data[ae] = env.eval(
                     new[ae], inner_namespace=data)
@@ -408,13 +443,16 @@ class layer:
             return
 
         # (see stat_spoke for one exception)
-        if self.stat.retransform:
-            stat_data = plot.scales.transform_df(stat_data)
+        if self.stat.retransform and stat_data:
+            stat_data = plot.scales.transform_df(
+                type(data)(stat_data, index=data.index))
+            stat_data = dict(stat_data.items())
 
         # When there are duplicate columns, we use the computed
-        # ones in stat_data
-        columns = data.columns.difference(stat_data.columns)
-        self.data = pd.concat([data[columns], stat_data], axis=1)
+        # ones in stat_data. If all the calculated aesthetics are
+        # already columns (e.g. y='..y..'), the data is unchanged.
+        if stat_data:
+            self.data = data.assign(**stat_data)
 
         # Add any new scales, if needed
         plot.scales.add_defaults(self.data, new)
@@ -424,8 +462,8 @@ class layer:
         Prepare/modify data for plotting
         """
         data = self.data
-        if len(data) == 0:
-            return type(data)()
+        if not len(data):
+            return data
 
         data = self.geom.setup_data(data)
 
@@ -485,6 +523,16 @@ class layer:
         self.stat.finish_layer(self.data, self.stat.params)
 
 
+def _merge_mappings(preferred, default):
+    """
+    Add the default mappings that are not in the preferred ones
+
+    This is :func:`~plotnine.utils.defaults` for dicts. The keys
+    of `preferred` come first, and their values are the ones kept.
+    """
+    return {**preferred, **default, **preferred}
+
+
 def add_group(data):
     if len(data) == 0:
         return data
@@ -492,31 +540,114 @@ def add_group(data):
     if 'group' not in data:
         disc = discrete_columns(data, ignore=['label'])
         if disc:
-            data['group'] = ninteraction(data[disc], drop=True)
+            group = _ninteraction_codes(data[disc])
+            if group is None:
+                group = ninteraction(data[disc], drop=True)
+            data['group'] = group
         else:
             data['group'] = NO_GROUP
     else:
-        data['group'] = ninteraction(data[['group']], drop=True)
+        group = data['group'].to_numpy()
+        if not _is_dense_group(group):
+            data['group'] = ninteraction(data[['group']], drop=True)
+        elif group.dtype != np.int64:
+            # Same dtype as the ids from ninteraction
+            data['group'] = group.astype(np.int64)
 
     return data
 
 
+def _ninteraction_codes(df):
+    """
+    Compute ninteraction(df, drop=True) from integer codes
+
+    Parameters
+    ----------
+    df : dataframe
+        Discrete columns of the data.
+
+    Returns
+    -------
+    out : numpy.array | None
+        Row assignments, starting at 1. None if the ids
+        cannot be computed from the codes.
+    """
+    columns = [x for _, x in df.items()]
+
+    # The ids of a lone categorical are its codes. Missing values
+    # get the id 0, as they do in ninteraction.
+    if len(columns) == 1 and pdtypes.is_categorical_dtype(columns[0]):
+        x = columns[0].cat.remove_unused_categories()
+        return x.cat.codes.to_numpy().astype(np.int64) + 1
+
+    # Combine the codes into one integer key per row, with the
+    # first column as the most significant digit. The unique keys
+    # are then in the lexicographic order of the levels.
+    key, size = None, 1
+    for x in columns:
+        if pdtypes.is_categorical_dtype(x):
+            # Missing values (code -1) are left to ninteraction
+            codes = x.cat.codes.to_numpy().astype(np.int64)
+            if (codes == -1).any():
+                return None
+            radix = max(len(x.cat.categories), 1)
+        elif x.dtype.kind == 'b':
+            codes = x.to_numpy().astype(np.int64)
+            radix = 2
+        else:
+            return None
+
+        if key is None:
+            key, size = codes, radix
+            continue
+
+        # Renumber the key if the next digit would overflow it
+        if size * radix > _MAX_KEY:
+            uniq, key = np.unique(key, return_inverse=True)
+            size = len(uniq)
+        key = key * radix + codes
+        size *= radix
+
+    # Unused levels leave no gaps in the ids. Unlike ninteraction,
+    # which combines the ids of the columns with their gaps for
+    # unused levels, distinct rows always get distinct ids.
+    _, ids = np.unique(key, return_inverse=True)
+    return ids + 1
+
+
+def _is_dense_group(arr):
+    """
+    Return True if arr is made up of the integers 1 to k
+
+    Such an array already holds valid group ids and need not
+    be renumbered.
+    """
+    if arr.dtype.kind not in 'iu':
+        return False
+    u = np.unique(arr)
+    return u[0] == 1 and u[-1] == len(u)
+
+
 def discrete_columns(df, ignore):
     """
     Return a list of the discrete columns in the
     dataframe `df`. `ignore` is a list|set|tuple with the
     names of the columns to skip.
     """
+    ignore = frozenset(ignore)
     lst = []
-    for col in df:
-        if array_kind.discrete(df[col]) and (col not in ignore):
-            # Some columns are represented as object dtype
-            # but may have compound structures as values.
+    for col, dtype in df.dtypes.items():
+        if dtype.kind not in DISCRETE_KINDS or col in ignore:
+            continue
+
+        # Some columns are represented as object dtype
+        # but may have compound structures as values.
+        if dtype.kind == 'O':
             try:
-                hash(df[col].iloc[0])
+                hash(df[col].iat[0])
             except TypeError:
                 continue
-            lst.append(col)
+        lst.append(col)
     return lst
 
 
@@ -529,5 +660,10 @@ def is_known_scalar(value):
         # versions of these types
         return pd.Series(value).dtype.kind in ('M', 'm')
 
-    return not np.iterable(value) and (isinstance(value, numbers.Number) or
-                                       _is_datetime_or_timedelta(value))
+    # Numbers are the common case and need no further checks
+    if isinstance(value, _SCALAR_TYPES):
+        return True
+
+    return (not np.iterable(value) and
+            (isinstance(value, _DATETIME_TYPES) or
+             _is_datetime_or_timedelta(value)))
@@ -224,10 +224,7 @@ class Scales(list):
             return
 
         # aesthetics with scales
-        aws = set()
-        if self:
-            for s in (set(sc.aesthetics) for sc in self):
-                aws.update(s)
+        aws = set(self.input())
 
         # aesthetics that do not have scales present
         # We preserve the order of the aesthetics
@@ -152,15 +152,13 @@ class stat(metaclass=Registry):
         """
         missing = (self.aesthetics() -
                    self.aes_params.keys() -
-                   set(data.columns))
+                   set(data.columns) -
+                   self.REQUIRED_AES)
 
-        for ae in missing-self.REQUIRED_AES:
+        for ae in missing:
             if self.DEFAULT_AES[ae] is not None:
                 data[ae] = self.DEFAULT_AES[ae]
 
-        missing = (self.aes_params.keys() -
-                   set(data.columns))
-
         for ae in self.aes_params:
             data[ae] = self.aes_params[ae]
 
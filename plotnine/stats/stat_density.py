@@ -139,7 +139,7 @@ class stat_density(stat):
 
 
 def compute_density(x, weight, range, **params):
-    x = np.asarray(x, dtype=np.float)
+    x = np.asarray(x, dtype=float)
     not_nan = ~np.isnan(x)
     x = x[not_nan]
     bw = params['bw']
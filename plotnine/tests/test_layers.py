@@ -1,9 +1,11 @@
 import pytest
+import numpy as np
 import pandas as pd
 
-from plotnine.layer import Layers, layer
+from plotnine.layer import Layers, layer, add_group
 from plotnine import ggplot, aes, geom_point
 from plotnine.exceptions import PlotnineError
+from plotnine.utils import ninteraction
 
 
 df = pd.DataFrame({'x': range(10),
@@ -91,3 +93,74 @@ def test_layer_with_nodata():
         p.draw_test()
 
     assert "Could not evaluate the 'x' mapping:" in pe.value.message
+
+
+def test_add_group(monkeypatch):
+    # Dense integer groups and a single categorical do not
+    # need ninteraction
+    def fail(*args, **kwargs):
+        raise AssertionError('ninteraction should not be called')
+
+    with monkeypatch.context() as m:
+        m.setattr('plotnine.layer.ninteraction', fail)
+
+        data = pd.DataFrame({'group': [2, 1, 2, 3]})
+        assert list(add_group(data)['group']) == [2, 1, 2, 3]
+
+        # int32 groups are kept, with the dtype of the ids
+        data = pd.DataFrame({
+            'group': np.array([2, 1, 2, 3], dtype=np.int32)
+        })
+        result = add_group(data)['group']
+        assert list(result) == [2, 1, 2, 3]
+        assert result.dtype == np.int64
+
+        # Unused categories do not leave gaps in the ids
+        data = pd.DataFrame({
+            'x': pd.Categorical(['c', 'a', 'c'],
+                                categories=['a', 'b', 'c'])
+        })
+        assert list(add_group(data)['group']) == [2, 1, 2]
+
+    # Other groups are renumbered
+    data = pd.DataFrame({'group': [5, 3, 5, 9]})
+    assert list(add_group(data)['group']) == [2, 1, 2, 3]
+
+
+def test_add_group_interaction():
+    data = pd.DataFrame({
+        'x': pd.Categorical(['b', 'a', 'b', 'a', 'b']),
+        'y': [True, True, False, True, True],
+        'z': pd.Categorical(['u', 'v', 'u', 'v', 'u'],
+                            categories=['v', 'u'])
+    })
+    result = add_group(data.copy())['group']
+    expected = ninteraction(data, drop=True)
+    assert list(result) == expected == [3, 1, 2, 1, 3]
+
+    # A single categorical, with unused categories and
+    # missing values
+    data = pd.DataFrame({
+        'x': pd.Categorical(['c', None, 'a', 'c'],
+                            categories=['a', 'b', 'c'])
+    })
+    result = add_group(data.copy())['group']
+    expected = ninteraction(data, drop=True)
+    assert list(result) == expected == [2, 0, 1, 2]
+
+    # Unused categories do not put different rows in the same group
+    data = pd.DataFrame({
+        'x': pd.Categorical([1, 2], categories=[3, 4, 1, 2]),
+        'y': pd.Categorical(['x', 'y'], categories=['y', 'z', 'x'])
+    })
+    assert list(add_group(data)['group']) == [1, 2]
+
+
+def test_layer_with_nodata_series_aesthetic():
+    # The index of the series is used for the layer data
+    s = pd.Series([1., 2., 3.], index=[10, 11, 12])
+    p = ggplot() + geom_point(aes(x=s, y=s))
+    p._build()
+    data = p.layers[0].data
+    assert list(data['x']) == [1, 2, 3]
+    assert list(data['y']) == [1, 2, 3]
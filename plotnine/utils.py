@@ -29,6 +29,10 @@ from .exceptions import PlotnineError, PlotnineWarning
 # this factor gives us the match.
 SIZE_FACTOR = np.sqrt(np.pi)
 
+# dtype kinds of arrays with discrete and continuous values
+DISCRETE_KINDS = 'ObUS'
+CONTINUOUS_KINDS = 'ifuc'
+
 
 def is_scalar_or_string(val):
     """
@@ -474,7 +478,7 @@ def jitter(x, factor=1, amount=None, random_state=None):
         z = 1
 
     if amount is None:
-        _x = np.round(x, 3-np.int(np.floor(np.log10(z)))).astype(np.int)
+        _x = np.round(x, 3-int(np.floor(np.log10(z)))).astype(int)
         xx = np.unique(np.sort(_x))
         d = np.diff(xx)
         if len(d):
@@ -1201,7 +1205,7 @@ class array_kind:
         out : bool
             Whether array `arr` is discrete
         """
-        return arr.dtype.kind in 'ObUS'
+        return arr.dtype.kind in DISCRETE_KINDS
 
     @staticmethod
     def continuous(arr):
@@ -1218,7 +1222,7 @@ class array_kind:
         out : bool
             Whether array `arr` is continuous
         """
-        return arr.dtype.kind in 'ifuc'
+        return arr.dtype.kind in CONTINUOUS_KINDS
 
     @staticmethod
     def datetime(arr):
@@ -1243,7 +1247,7 @@ class array_kind:
         out : bool
             Whether array `arr` is an ordered categorical
         """
-        if pdtypes.is_categorical(arr):
+        if pdtypes.is_categorical_dtype(arr):
             return arr.cat.ordered
         return False
 